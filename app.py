@@ -44,8 +44,14 @@ def main():
         """)
         st.stop()
     
-    # Check database connection
-    if not check_database_connection():
+    # Check database connection once per session
+    if st.sidebar.button("🔌 Re-check connection", key="recheck_connection"):
+        st.session_state.pop("db_ok", None)
+    
+    if "db_ok" not in st.session_state:
+        st.session_state.db_ok = check_database_connection()
+    
+    if not st.session_state.db_ok:
         display_setup_instructions()
         st.stop()
     
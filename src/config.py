@@ -4,6 +4,7 @@ Configuration module for Unity Catalog Image Gallery.
 Contains constants, environment variable handling, and configuration settings.
 """
 
+import functools
 import os
 from typing import Optional
 
@@ -17,18 +18,36 @@ VOLUME_BASE_PATH = "/Volumes/demos/image_app/images" # Update to the location fo
 DEFAULT_ITEMS_PER_PAGE = 24
 
 # Connection settings
-TOKEN_REFRESH_INTERVAL = 900  # 15 minutes in seconds
-CONNECTION_POOL_MIN_SIZE = 2
-CONNECTION_POOL_MAX_SIZE = 10
+TOKEN_REFRESH_INTERVAL = 900  # 15 minutes in seconds - fallback when token has no expiry
+TOKEN_EXPIRY_BUFFER = 60  # refresh this many seconds before the token expires
+CONNECTION_POOL_MIN_SIZE = int(os.getenv('PG_POOL_MIN', '4'))  # warm connections kept open
+CONNECTION_POOL_MAX_SIZE = int(os.getenv('PG_POOL_MAX', '10'))
+CONNECTION_POOL_NUM_WORKERS = 4  # background workers opening connections in parallel
+PREPARE_THRESHOLD = 0  # prior executions before psycopg prepares a query (0 = first execution)
+
+# Cache settings
+FILTER_CACHE_TTL = 60  # seconds - bounds staleness of cached filter options
+QUERY_CACHE_TTL = 60  # seconds - bounds staleness of cached image path queries
+QUERY_CACHE_MAX_ENTRIES = 256  # page cursors multiply cache keys
+ALL_PATHS_CACHE_MAX_ENTRIES = 64  # full path lists per filter set are larger
+IMAGE_CACHE_MAX_ENTRIES = 512  # thumbnails - bounds memory to roughly entries * thumbnail size
+FULL_IMAGE_CACHE_MAX_ENTRIES = 64  # full-size display images are much larger per entry
+# Encoded bytes are what the panels render from, so they share the decoded caps
+RENDER_CACHE_MAX_ENTRIES = FULL_IMAGE_CACHE_MAX_ENTRIES  # encoded full-size images
+THUMBNAIL_RENDER_CACHE_MAX_ENTRIES = IMAGE_CACHE_MAX_ENTRIES  # encoded thumbnails
 
 # UI configuration
 DEFAULT_ITEMS_PER_PAGE = 24
 ITEMS_PER_PAGE_OPTIONS = [12, 24, 48]
 GRID_COLUMNS_PER_ROW = 4
 IMAGE_THUMBNAIL_SIZE = (200, 200)
+FULL_IMAGE_MAX_SIZE = (1600, 1600)  # full-size view is downscaled to fit within this
+JPEG_QUALITY = 90  # quality for opaque images sent to the browser
+MAX_DROPDOWN_OPTIONS = 50  # cap on options rendered into each image dropdown
 
 # API configuration
 REQUEST_TIMEOUT = 10  # seconds
+IMAGE_LOAD_WORKERS = 8  # concurrent downloads when prefetching selected images
 API_FILES_PATH = "/api/2.0/fs/files/"
 
 
@@ -37,6 +56,7 @@ def get_databricks_host() -> Optional[str]:
     return os.getenv('DATABRICKS_HOST', '')
 
 
+@functools.lru_cache(maxsize=1)
 def get_pg_connection_params() -> dict:
     """Get PostgreSQL connection parameters from environment variables."""
     return {
@@ -49,22 +69,20 @@ def get_pg_connection_params() -> dict:
     }
 
 
+# The environment doesn't change mid-process, so check it once at import time
+REQUIRED_ENV_VARS = (
+    'DATABRICKS_HOST',
+    'PGDATABASE',
+    'PGUSER',
+    'PGHOST',
+    'PGPORT'
+)
+MISSING_ENV_VARS = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+
+
 def validate_required_env_vars() -> list:
     """Validate that required environment variables are set."""
-    required_vars = [
-        'DATABRICKS_HOST',
-        'PGDATABASE',
-        'PGUSER',
-        'PGHOST',
-        'PGPORT'
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-    
-    return missing_vars
+    return MISSING_ENV_VARS
 
 
 def get_all_env_vars() -> dict:
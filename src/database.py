@@ -5,22 +5,65 @@ Handles PostgreSQL connections, OAuth token management, and data queries
 for the Lakebase integration.
 """
 
+import threading
 import time
-from typing import Optional, List, Tuple, Any
+from typing import Optional, List, Tuple, Dict, Any
 import streamlit as st
 from databricks import sdk
+import psycopg
 from psycopg import sql
 from psycopg_pool import ConnectionPool
 
 from .config import (
-    TABLE_NAME, PATH_COLUMN, TOKEN_REFRESH_INTERVAL,
-    CONNECTION_POOL_MIN_SIZE, CONNECTION_POOL_MAX_SIZE,
+    TABLE_NAME, PATH_COLUMN, TOKEN_REFRESH_INTERVAL, TOKEN_EXPIRY_BUFFER,
+    CONNECTION_POOL_MIN_SIZE, CONNECTION_POOL_MAX_SIZE, CONNECTION_POOL_NUM_WORKERS,
+    PREPARE_THRESHOLD,
+    FILTER_CACHE_TTL, QUERY_CACHE_TTL, QUERY_CACHE_MAX_ENTRIES, ALL_PATHS_CACHE_MAX_ENTRIES,
     get_pg_connection_params
 )
 
 # Import DEFAULT_SCHEMA as mutable for dynamic updates
 from . import config
 
+# Filter out non-image rows server-side so they never reach the UI
+IMAGE_EXT_PREDICATE = PATH_COLUMN + r" ~* '\.(jpe?g|png|gif|webp|bmp)$'"
+
+
+def _filter_conditions(search_term: Optional[str],
+                       label: Optional[str],
+                       label_detail: Optional[str],
+                       min_score: Optional[float],
+                       max_score: Optional[float]) -> Tuple[List[str], List[Any]]:
+    """Build WHERE conditions and parameters shared by the image path queries.
+    
+    Conditions are always emitted in the same order, so a given filter set
+    produces identical SQL text across queries and calls.
+    """
+    conditions = [IMAGE_EXT_PREDICATE]
+    params = []
+    
+    if search_term:
+        conditions.append(f"{PATH_COLUMN} ILIKE %s")
+        params.append(f"%{search_term}%")
+    
+    if label:
+        conditions.append("label = %s")
+        params.append(label)
+    
+    if label_detail:
+        conditions.append('"labelDetail" = %s')
+        params.append(label_detail)
+    
+    if min_score is not None:
+        conditions.append("score >= %s")
+        params.append(min_score)
+    
+    if max_score is not None:
+        conditions.append("score <= %s")
+        params.append(max_score)
+    
+    return conditions, params
+
 
 class DatabaseManager:
     """Manages database connections and operations."""
@@ -29,32 +72,60 @@ class DatabaseManager:
         self.workspace_client = sdk.WorkspaceClient()
         self.postgres_password = None
         self.last_password_refresh = 0
+        self.token_expiry = 0
         self.connection_pool = None
+        # Script threads and pool workers both refresh the token
+        self._token_lock = threading.Lock()
+    
+    def token_needs_refresh(self) -> bool:
+        """Check whether the OAuth token is missing or about to expire."""
+        return (self.postgres_password is None or
+                time.time() + TOKEN_EXPIRY_BUFFER >= self.token_expiry)
     
     def refresh_oauth_token(self) -> None:
-        """Refresh OAuth token if expired."""
-        if (self.postgres_password is None or 
-            time.time() - self.last_password_refresh > TOKEN_REFRESH_INTERVAL):
+        """Refresh OAuth token if it is close to expiry."""
+        try:
+            self._refresh_token_if_needed()
+        except Exception as e:
+            st.error(f"❌ Failed to refresh OAuth token: {str(e)}")
+            st.stop()
+    
+    def _refresh_token_if_needed(self) -> None:
+        """Refresh OAuth token if it is close to expiry, raising on failure.
+        
+        Safe to call from pool worker threads - it never touches the UI.
+        """
+        if not self.token_needs_refresh():
+            return
+        
+        with self._token_lock:
+            # Another thread may have refreshed while this one waited
+            if not self.token_needs_refresh():
+                return
             
             print("Refreshing PostgreSQL OAuth token")
-            try:
-                self.postgres_password = self.workspace_client.config.oauth_token().access_token
-                self.last_password_refresh = time.time()
-            except Exception as e:
-                st.error(f"❌ Failed to refresh OAuth token: {str(e)}")
-                st.stop()
+            token = self.workspace_client.config.oauth_token()
+            
+            self.last_password_refresh = time.time()
+            # Fall back to the fixed refresh interval if the SDK gives no expiry
+            if token.expiry is not None:
+                self.token_expiry = token.expiry.timestamp()
+            else:
+                self.token_expiry = self.last_password_refresh + TOKEN_REFRESH_INTERVAL
+            
+            self.postgres_password = token.access_token
     
     def get_connection_pool(self) -> ConnectionPool:
         """Get or create the connection pool."""
         if self.connection_pool is None:
             self.refresh_oauth_token()
             
-            # Build connection string
+            # Build connection string - the password is injected per connection
+            # so token rotation doesn't require rebuilding the pool
             params = get_pg_connection_params()
             conn_string = (
                 f"dbname={params['dbname']} "
                 f"user={params['user']} "
-                f"password={self.postgres_password} "
                 f"host={params['host']} "
                 f"port={params['port']} "
                 f"sslmode={params['sslmode']} "
@@ -63,73 +134,68 @@ class DatabaseManager:
             
             self.connection_pool = ConnectionPool(
                 conn_string,
+                connection_class=self._oauth_connection_class(),
+                configure=self._configure_connection,
                 min_size=CONNECTION_POOL_MIN_SIZE,
-                max_size=CONNECTION_POOL_MAX_SIZE
+                max_size=CONNECTION_POOL_MAX_SIZE,
+                num_workers=CONNECTION_POOL_NUM_WORKERS,
+                open=True
             )
         
         return self.connection_pool
     
+    @staticmethod
+    def _configure_connection(conn: psycopg.Connection) -> None:
+        """Configure a newly opened pool connection."""
+        # Prepare statements server-side on their first execution, so any
+        # repeat of the same filter query on this connection (e.g. after the
+        # result cache expires) skips planning. The query caches absorb most
+        # repeats, so this only trims planning work on cache misses.
+        conn.prepare_threshold = PREPARE_THRESHOLD
+    
+    def _oauth_connection_class(self) -> type:
+        """Build a connection class that reads the current OAuth token on connect."""
+        manager = self
+        
+        class OAuthConnection(psycopg.Connection):
+            @classmethod
+            def connect(cls, conninfo: str = "", **kwargs):
+                # The pool replaces connections in the background (max_lifetime),
+                # possibly long after the last get_connection() refreshed the token
+                manager._refresh_token_if_needed()
+                kwargs["password"] = manager.postgres_password
+                return super().connect(conninfo, **kwargs)
+        
+        return OAuthConnection
+    
     def get_connection(self):
         """Get a connection from the pool."""
-        # Recreate pool if token expired
-        if (self.postgres_password is None or 
-            time.time() - self.last_password_refresh > TOKEN_REFRESH_INTERVAL):
-            if self.connection_pool:
-                self.connection_pool.close()
-                self.connection_pool = None
+        # Rotate the token in place - existing connections stay authenticated
+        # and only newly opened connections pick up the new password
+        self.refresh_oauth_token()
         
         return self.get_connection_pool().connection()
     
-    def find_table_schema(self, table: str = TABLE_NAME) -> Optional[str]:
-        """Find which schema contains the target table."""
+    def check_table_exists(self, schema: str = None, table: str = TABLE_NAME) -> bool:
+        """Check if the required table exists in the database."""
+        if schema is None:
+            schema = config.DEFAULT_SCHEMA
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
+                    # Single round-trip: prefer the configured schema, otherwise
+                    # fall back to the first schema containing the table
                     cur.execute("""
                         SELECT table_schema
                         FROM information_schema.tables 
                         WHERE table_name = %s
-                        ORDER BY table_schema
+                        ORDER BY (table_schema = %s) DESC, table_schema
                         LIMIT 1
-                    """, (table,))
+                    """, (table, schema))
                     result = cur.fetchone()
-                    return result[0] if result else None
-        except Exception:
-            # Silently handle table schema search errors
-            return None
-    
-    def check_table_exists(self, schema: str = None, table: str = TABLE_NAME) -> bool:
-        """Check if the required table exists in the database."""
-        if schema is None:
-            schema = config.DEFAULT_SCHEMA
-        try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cur:
-                    # Check current database and schema
-                    cur.execute("SELECT current_database(), current_schema()")
-                    cur.fetchone()  # Execute but don't store unused result
-                    
-                    # List all schemas
-                    cur.execute("SELECT schema_name FROM information_schema.schemata")
-                    cur.fetchall()  # Execute but don't store unused result
-                    
-                    # First try the configured schema
-                    cur.execute("""
-                        SELECT EXISTS (
-                            SELECT FROM information_schema.tables 
-                            WHERE table_schema = %s 
-                            AND table_name = %s
-                        )
-                    """, (schema, table))
-                    result = cur.fetchone()[0]
                     
                     if result:
-                        return True
-                        
-                    # If not found, search across all schemas
-                    found_schema = self.find_table_schema(table)
-                    if found_schema:
-                        config.DEFAULT_SCHEMA = found_schema
+                        config.DEFAULT_SCHEMA = result[0]
                         return True
                         
                     return False
@@ -143,49 +209,43 @@ class DatabaseManager:
                        label_detail: Optional[str] = None,
                        min_score: Optional[float] = None,
                        max_score: Optional[float] = None,
-                       schema: str = None) -> List[Tuple[Any, ...]]:
-        """Fetch image paths from the database with optional filtering and pagination."""
+                       schema: str = None,
+                       after_path: Optional[str] = None) -> List[Tuple[Any, ...]]:
+        """Fetch image paths from the database with optional filtering and pagination.
+        
+        Pass the last path of the previous page as ``after_path`` for keyset
+        pagination; ``offset`` is only used when no cursor is given (e.g. when
+        jumping to an arbitrary page).
+        """
         if schema is None:
             schema = config.DEFAULT_SCHEMA
-            
+        
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 table_ref = sql.Identifier(schema, TABLE_NAME)
                 
-                # Build WHERE conditions
-                conditions = []
-                params = []
-                
-                if search_term:
-                    conditions.append(f"{PATH_COLUMN} ILIKE %s")
-                    params.append(f"%{search_term}%")
-                
-                if label:
-                    conditions.append("label = %s")
-                    params.append(label)
-                
-                if label_detail:
-                    conditions.append('"labelDetail" = %s') 
-                    params.append(label_detail)
-                
-                if min_score is not None:
-                    conditions.append("score >= %s")
-                    params.append(min_score)
+                # Build WHERE conditions - only rows with renderable image extensions
+                conditions, params = _filter_conditions(search_term, label, label_detail,
+                                                        min_score, max_score)
                 
-                if max_score is not None:
-                    conditions.append("score <= %s")
-                    params.append(max_score)
+                # Keyset pagination - seek past the cursor via the path index
+                # instead of scanning and discarding OFFSET rows
+                if after_path is not None:
+                    conditions.append(f"{PATH_COLUMN} > %s")
+                    params.append(after_path)
                 
                 # Build query
                 base_query = f"SELECT {PATH_COLUMN} FROM {{}} "
-                if conditions:
-                    where_clause = "WHERE " + " AND ".join(conditions)
-                    base_query += where_clause + " "
+                base_query += "WHERE " + " AND ".join(conditions) + " "
                 
-                base_query += f"ORDER BY {PATH_COLUMN} LIMIT %s OFFSET %s"
+                if after_path is not None:
+                    base_query += f"ORDER BY {PATH_COLUMN} LIMIT %s"
+                    params.append(limit)
+                else:
+                    base_query += f"ORDER BY {PATH_COLUMN} LIMIT %s OFFSET %s"
+                    params.extend([limit, offset])
                 
                 query = sql.SQL(base_query).format(table_ref)
-                params.extend([limit, offset])
                 cur.execute(query, params)
                 
                 return cur.fetchall()
@@ -199,36 +259,18 @@ class DatabaseManager:
         """Get all image paths with optional filtering for dropdown selection."""
         if schema is None:
             schema = config.DEFAULT_SCHEMA
-            
+        
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 table_ref = sql.Identifier(schema, TABLE_NAME)
                 
-                # Build WHERE conditions
-                conditions = []
-                params = []
-                
-                if label:
-                    conditions.append("label = %s")
-                    params.append(label)
-                
-                if label_detail:
-                    conditions.append('"labelDetail" = %s')
-                    params.append(label_detail)
-                
-                if min_score is not None:
-                    conditions.append("score >= %s")
-                    params.append(min_score)
-                
-                if max_score is not None:
-                    conditions.append("score <= %s")
-                    params.append(max_score)
+                # Build WHERE conditions - only rows with renderable image extensions
+                conditions, params = _filter_conditions(None, label, label_detail,
+                                                        min_score, max_score)
                 
                 # Build query
                 base_query = f"SELECT {PATH_COLUMN} FROM {{}} "
-                if conditions:
-                    where_clause = "WHERE " + " AND ".join(conditions)
-                    base_query += where_clause + " "
+                base_query += "WHERE " + " AND ".join(conditions) + " "
                 
                 base_query += f"ORDER BY {PATH_COLUMN}"
                 
@@ -238,29 +280,11 @@ class DatabaseManager:
                 # Return list of paths (each record is a tuple with one element)
                 return [record[0] for record in cur.fetchall()]
     
-    def get_distinct_labels(self, schema: str = None) -> List[str]:
-        """Get distinct label values from the database."""
-        if schema is None:
-            schema = config.DEFAULT_SCHEMA
-            
-        with self.get_connection() as conn:
-            with conn.cursor() as cur:
-                table_ref = sql.Identifier(schema, TABLE_NAME)
-                
-                query = sql.SQL("""
-                    SELECT DISTINCT label FROM {} 
-                    WHERE label IS NOT NULL 
-                    ORDER BY label
-                """).format(table_ref)
-                cur.execute(query)
-                
-                return [record[0] for record in cur.fetchall()]
-    
     def get_distinct_label_details(self, label: Optional[str] = None, schema: str = None) -> List[str]:
         """Get distinct labelDetail values, optionally filtered by label."""
         if schema is None:
             schema = config.DEFAULT_SCHEMA
-            
+                
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 table_ref = sql.Identifier(schema, TABLE_NAME)
@@ -283,26 +307,51 @@ class DatabaseManager:
                 
                 return [record[0] for record in cur.fetchall()]
     
-    def get_score_range(self, schema: str = None) -> Tuple[float, float]:
-        """Get the min and max score values from the database."""
+    def get_filter_facets(self, schema: str = None) -> Dict[str, Any]:
+        """Get labels, label details, and the score range in a single query."""
         if schema is None:
             schema = config.DEFAULT_SCHEMA
-            
+                
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 table_ref = sql.Identifier(schema, TABLE_NAME)
                 
                 query = sql.SQL("""
-                    SELECT MIN(score), MAX(score) FROM {} 
-                    WHERE score IS NOT NULL
+                    WITH t AS (SELECT label, "labelDetail", score FROM {})
+                    SELECT 'label', label FROM t
+                    WHERE label IS NOT NULL GROUP BY label
+                    UNION ALL
+                    SELECT 'detail', "labelDetail" FROM t
+                    WHERE "labelDetail" IS NOT NULL GROUP BY "labelDetail"
+                    UNION ALL
+                    SELECT 'score_min', MIN(score)::text FROM t
+                    UNION ALL
+                    SELECT 'score_max', MAX(score)::text FROM t
+                    ORDER BY 1, 2
                 """).format(table_ref)
                 cur.execute(query)
                 
-                result = cur.fetchone()
-                if result and result[0] is not None and result[1] is not None:
-                    return (float(result[0]), float(result[1]))
+                labels = []
+                label_details = []
+                scores = {}
+                for kind, value in cur.fetchall():
+                    if kind == 'label':
+                        labels.append(value)
+                    elif kind == 'detail':
+                        label_details.append(value)
+                    else:
+                        scores[kind] = value
+                
+                if scores.get('score_min') is not None and scores.get('score_max') is not None:
+                    score_range = (float(scores['score_min']), float(scores['score_max']))
                 else:
-                    return (0.0, 1.0)  # Default range
+                    score_range = (0.0, 1.0)  # Default range
+                
+                return {
+                    'labels': labels,
+                    'label_details': label_details,
+                    'score_range': score_range
+                }
     
     def get_total_image_count(self, 
                              search_term: Optional[str] = None,
@@ -311,59 +360,138 @@ class DatabaseManager:
                              min_score: Optional[float] = None,
                              max_score: Optional[float] = None,
                              schema: str = None) -> int:
-        """Get total count of images with filtering for pagination."""
+        """Get total count of images with filtering for pagination.
+        
+        Paged views should prefer ``get_page_and_total``, which returns the
+        count alongside the page rows in a single query.
+        """
         if schema is None:
             schema = config.DEFAULT_SCHEMA
-            
+        
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 table_ref = sql.Identifier(schema, TABLE_NAME)
                 
-                # Build WHERE conditions
-                conditions = []
-                params = []
+                # Build WHERE conditions - only rows with renderable image extensions
+                conditions, params = _filter_conditions(search_term, label, label_detail,
+                                                        min_score, max_score)
                 
-                if search_term:
-                    conditions.append(f"{PATH_COLUMN} ILIKE %s")
-                    params.append(f"%{search_term}%")
+                # Build query
+                base_query = "SELECT COUNT(*) FROM {} "
+                base_query += "WHERE " + " AND ".join(conditions)
                 
-                if label:
-                    conditions.append("label = %s")
-                    params.append(label)
+                query = sql.SQL(base_query).format(table_ref)
+                cur.execute(query, params)
                 
-                if label_detail:
-                    conditions.append('"labelDetail" = %s')
-                    params.append(label_detail)
+                return cur.fetchone()[0]
+    
+    def get_page_and_total(self, limit: int = 50, offset: int = 0,
+                           search_term: Optional[str] = None,
+                           label: Optional[str] = None,
+                           label_detail: Optional[str] = None,
+                           min_score: Optional[float] = None,
+                           max_score: Optional[float] = None,
+                           schema: str = None) -> Tuple[List[Tuple[Any, ...]], int]:
+        """Fetch a page of image paths and the total filtered count in one query."""
+        if schema is None:
+            schema = config.DEFAULT_SCHEMA
+        
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                table_ref = sql.Identifier(schema, TABLE_NAME)
                 
-                if min_score is not None:
-                    conditions.append("score >= %s")
-                    params.append(min_score)
+                # Build WHERE conditions - only rows with renderable image extensions
+                conditions, params = _filter_conditions(search_term, label, label_detail,
+                                                        min_score, max_score)
                 
-                if max_score is not None:
-                    conditions.append("score <= %s")
-                    params.append(max_score)
+                # Build query - the window count is computed over the filtered rows
+                # before LIMIT/OFFSET, so the filter is only evaluated once
+                base_query = f"SELECT {PATH_COLUMN}, COUNT(*) OVER () FROM {{}} "
+                base_query += "WHERE " + " AND ".join(conditions) + " "
                 
-                # Build query
-                base_query = "SELECT COUNT(*) FROM {} "
-                if conditions:
-                    where_clause = "WHERE " + " AND ".join(conditions)
-                    base_query += where_clause
+                base_query += f"ORDER BY {PATH_COLUMN} LIMIT %s OFFSET %s"
                 
                 query = sql.SQL(base_query).format(table_ref)
+                params.extend([limit, offset])
                 cur.execute(query, params)
                 
-                return cur.fetchone()[0]
-    
+                records = cur.fetchall()
+                total = records[0][1] if records else 0
+                return [(record[0],) for record in records], total
+
+
+# Cached paged queries - keyed on the full filter/pagination state so reruns
+# with unchanged filters skip the database entirely
+@st.cache_data(ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_image_paths(schema: str,
+                        label: Optional[str],
+                        label_detail: Optional[str],
+                        min_score: Optional[float],
+                        max_score: Optional[float],
+                        search_term: Optional[str],
+                        limit: int,
+                        offset: int,
+                        after_path: Optional[str]) -> List[Tuple[Any, ...]]:
+    return get_db_manager().get_image_paths(limit, offset, search_term, label, label_detail,
+                                            min_score, max_score, schema, after_path)
+
+
+@st.cache_data(ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_total_image_count(schema: str,
+                              label: Optional[str],
+                              label_detail: Optional[str],
+                              min_score: Optional[float],
+                              max_score: Optional[float],
+                              search_term: Optional[str]) -> int:
+    return get_db_manager().get_total_image_count(search_term, label, label_detail,
+                                                  min_score, max_score, schema)
+
+
+@st.cache_data(ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_page_and_total(schema: str,
+                           label: Optional[str],
+                           label_detail: Optional[str],
+                           min_score: Optional[float],
+                           max_score: Optional[float],
+                           search_term: Optional[str],
+                           limit: int,
+                           offset: int) -> Tuple[List[Tuple[Any, ...]], int]:
+    return get_db_manager().get_page_and_total(limit, offset, search_term, label, label_detail,
+                                               min_score, max_score, schema)
+
 
+@st.cache_data(ttl=QUERY_CACHE_TTL, max_entries=ALL_PATHS_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_all_image_paths(schema: str,
+                            label: Optional[str],
+                            label_detail: Optional[str],
+                            min_score: Optional[float],
+                            max_score: Optional[float]) -> List[str]:
+    return get_db_manager().get_all_image_paths(label, label_detail, min_score, max_score, schema)
 
-# Global database manager instance
-db_manager = DatabaseManager()
+
+# Global database manager instance - one per process, shared across sessions
+@st.cache_resource(show_spinner=False)
+def get_db_manager() -> DatabaseManager:
+    """Get the shared database manager, creating it on first use."""
+    return DatabaseManager()
 
 
 # Convenience functions
 def check_database_connection() -> bool:
     """Check if we can connect to the database and table exists."""
-    return db_manager.check_table_exists()
+    return get_db_manager().check_table_exists()
+
+
+def get_image_paths(limit: int = 50, offset: int = 0,
+                    search_term: Optional[str] = None,
+                    label: Optional[str] = None,
+                    label_detail: Optional[str] = None,
+                    min_score: Optional[float] = None,
+                    max_score: Optional[float] = None,
+                    after_path: Optional[str] = None) -> List[Tuple[Any, ...]]:
+    """Fetch image paths with optional filtering and keyset or offset pagination."""
+    return _cached_image_paths(config.DEFAULT_SCHEMA, label, label_detail, min_score, max_score,
+                               search_term, limit, offset, after_path)
 
 
 def get_all_image_paths(label: Optional[str] = None, 
@@ -371,19 +499,60 @@ def get_all_image_paths(label: Optional[str] = None,
                         min_score: Optional[float] = None,
                         max_score: Optional[float] = None) -> List[str]:
     """Get all image paths with optional filtering for dropdown selection."""
-    return db_manager.get_all_image_paths(label, label_detail, min_score, max_score)
+    return _cached_all_image_paths(config.DEFAULT_SCHEMA, label, label_detail, min_score, max_score)
+
 
+def get_total_image_count(search_term: Optional[str] = None,
+                          label: Optional[str] = None,
+                          label_detail: Optional[str] = None,
+                          min_score: Optional[float] = None,
+                          max_score: Optional[float] = None) -> int:
+    """Get total count of images with filtering for pagination."""
+    return _cached_total_image_count(config.DEFAULT_SCHEMA, label, label_detail,
+                                     min_score, max_score, search_term)
 
-def get_distinct_labels() -> List[str]:
-    """Get distinct label values from the database."""
-    return db_manager.get_distinct_labels()
+
+def get_page_and_total(limit: int = 50, offset: int = 0,
+                       search_term: Optional[str] = None,
+                       label: Optional[str] = None,
+                       label_detail: Optional[str] = None,
+                       min_score: Optional[float] = None,
+                       max_score: Optional[float] = None) -> Tuple[List[Tuple[Any, ...]], int]:
+    """Fetch a page of image paths and the total filtered count in one query."""
+    return _cached_page_and_total(config.DEFAULT_SCHEMA, label, label_detail, min_score, max_score,
+                                  search_term, limit, offset)
 
 
 def get_distinct_label_details(label: Optional[str] = None) -> List[str]:
     """Get distinct labelDetail values, optionally filtered by label."""
-    return db_manager.get_distinct_label_details(label)
+    if not label:
+        # All details are already part of the cached filter facets
+        return get_filter_facets()['label_details']
+    return _cached_label_details(label, config.DEFAULT_SCHEMA)
+
+
+def get_filter_facets() -> Dict[str, Any]:
+    """Get labels, label details, and the score range in a single query."""
+    return _cached_filter_facets(config.DEFAULT_SCHEMA)
+
+
+def clear_filter_cache() -> None:
+    """Clear cached query results so the next call re-queries the database."""
+    _cached_label_details.clear()
+    _cached_filter_facets.clear()
+    _cached_image_paths.clear()
+    _cached_all_image_paths.clear()
+    _cached_total_image_count.clear()
+    _cached_page_and_total.clear()
+
+
+# Cached filter option queries - these values change rarely, so reruns
+# triggered by widget interactions reuse the result sets for a short TTL
+@st.cache_data(ttl=FILTER_CACHE_TTL, show_spinner=False)
+def _cached_label_details(label: Optional[str], schema: str) -> List[str]:
+    return get_db_manager().get_distinct_label_details(label, schema)
 
 
-def get_score_range() -> Tuple[float, float]:
-    """Get the min and max score values from the database."""
-    return db_manager.get_score_range()
+@st.cache_data(ttl=FILTER_CACHE_TTL, show_spinner=False)
+def _cached_filter_facets(schema: str) -> Dict[str, Any]:
+    return get_db_manager().get_filter_facets(schema)
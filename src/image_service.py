@@ -4,117 +4,166 @@ Image service module for Unity Catalog Image Gallery.
 Handles image loading from Unity Catalog volumes using the Databricks SDK.
 """
 
-from typing import Optional
+import os
+import re
+from typing import Optional, Tuple
 from io import BytesIO
 import streamlit as st
 from PIL import Image
 
-from .database import db_manager
+from .config import (
+    VOLUME_BASE_PATH, IMAGE_CACHE_MAX_ENTRIES, FULL_IMAGE_CACHE_MAX_ENTRIES,
+    IMAGE_THUMBNAIL_SIZE, FULL_IMAGE_MAX_SIZE
+)
+from .database import get_db_manager
 # Image service for Unity Catalog volume operations
 
+# Precompiled path matching - covers both '/Volumes/...' and 'dbfs:/Volumes/...'
+_VOLUMES_RE = re.compile(r'^(?:dbfs:)?(/Volumes/.+)$')
+_IMG_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
+
 
 class ImageService:
     """Service for loading images from Unity Catalog volumes."""
     
-    def __init__(self):
-        self.workspace_client = db_manager.workspace_client
-    
+    def normalize_volume_path(self, file_path: str) -> Optional[str]:
+        """Normalize a database path to the /Volumes/... format the SDK expects."""
+        # Ensure file_path is a string and not None/empty
+        if not file_path:
+            st.warning("⚠️ Empty file path provided")
+            return None
+            
+        # Convert to string if it isn't already (handles integer IDs from database)
+        file_path_str = str(file_path).strip()
+        
+        # Normalize file path - remove dbfs: prefix if present 
+        # WorkspaceClient expects just /Volumes/... format
+        match = _VOLUMES_RE.match(file_path_str)
+        if match:
+            normalized_path = match.group(1)
+        else:
+            # Try to handle other common formats
+            if file_path_str.isdigit():
+                st.warning(f"⚠️ Path appears to be numeric ID: {file_path_str}")
+                return None
+            elif '/' not in file_path_str:
+                # Check if it's just a filename - try to construct path
+                if os.path.splitext(file_path_str)[1].lower() in _IMG_EXTS:
+                    # It's likely an image file, try to construct the full path
+                    potential_path = f"{VOLUME_BASE_PATH}/{file_path_str}"
+                    st.info(f"🔧 Attempting to construct path from filename: `{potential_path}`")
+                    normalized_path = potential_path
+                else:
+                    st.warning(f"⚠️ Path appears to be just filename without extension: {file_path_str}")
+                    return None
+            elif file_path_str.startswith('/'):
+                # Might be a filesystem path, check if it needs /Volumes prefix
+                if '/Volumes/' not in file_path_str:
+                    st.warning(f"⚠️ Filesystem path doesn't contain /Volumes/: {file_path_str}")
+                    return None
+                else:
+                    # Extract the /Volumes/ part
+                    volumes_index = file_path_str.find('/Volumes/')
+                    normalized_path = file_path_str[volumes_index:]
+                    st.info(f"🔧 Extracted volume path: `{normalized_path}`")
+            else:
+                st.warning(f"⚠️ Invalid volume path format: {file_path_str}")
+                st.info("Expected formats: '/Volumes/catalog/schema/volume/file' or 'dbfs:/Volumes/catalog/schema/volume/file'")
+                return None
+        
+        return normalized_path
     
-    def load_image_from_volume(self, file_path: str) -> Optional[Image.Image]:
+    def load_image_from_volume(self, file_path: str,
+                               thumbnail: bool = False) -> Optional[Image.Image]:
         """Load image from Unity Catalog volume using Databricks SDK."""
         try:
-            # Ensure file_path is a string and not None/empty
-            if not file_path:
-                st.warning("⚠️ Empty file path provided")
+            normalized_path = self.normalize_volume_path(file_path)
+            if normalized_path is None:
                 return None
-                
-            # Convert to string if it isn't already (handles integer IDs from database)
-            file_path_str = str(file_path).strip()
-            
-            
-            # Normalize file path - remove dbfs: prefix if present 
-            # WorkspaceClient expects just /Volumes/... format
-            if file_path_str.startswith('dbfs:/Volumes/'):
-                normalized_path = file_path_str.replace('dbfs:', '')
-            elif file_path_str.startswith('/Volumes/'):
-                normalized_path = file_path_str
-            else:
-                # Try to handle other common formats
-                if file_path_str.isdigit():
-                    st.warning(f"⚠️ Path appears to be numeric ID: {file_path_str}")
-                    return None
-                elif '/' not in file_path_str:
-                    # Check if it's just a filename - try to construct path
-                    if '.' in file_path_str and any(file_path_str.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']):
-                        # It's likely an image file, try to construct the full path
-                        from .config import VOLUME_BASE_PATH
-                        potential_path = f"{VOLUME_BASE_PATH}/{file_path_str}"
-                        st.info(f"🔧 Attempting to construct path from filename: `{potential_path}`")
-                        normalized_path = potential_path
-                    else:
-                        st.warning(f"⚠️ Path appears to be just filename without extension: {file_path_str}")
-                        return None
-                elif file_path_str.startswith('/'):
-                    # Might be a filesystem path, check if it needs /Volumes prefix
-                    if '/Volumes/' not in file_path_str:
-                        st.warning(f"⚠️ Filesystem path doesn't contain /Volumes/: {file_path_str}")
-                        return None
-                    else:
-                        # Extract the /Volumes/ part
-                        volumes_index = file_path_str.find('/Volumes/')
-                        normalized_path = file_path_str[volumes_index:]
-                        st.info(f"🔧 Extracted volume path: `{normalized_path}`")
-                else:
-                    st.warning(f"⚠️ Invalid volume path format: {file_path_str}")
-                    st.info("Expected formats: '/Volumes/catalog/schema/volume/file' or 'dbfs:/Volumes/catalog/schema/volume/file'")
-                    return None
-            
-            # Use Databricks SDK to download file
             
-            # Download the file - try different methods to get content
-            download_response = self.workspace_client.files.download(normalized_path)
-            
-            # Handle the streaming response to get file content
-            try:
-                # download_response.contents returns a StreamingResponse - read from it
-                file_data = download_response.contents.read()
-            except AttributeError:
-                try:
-                    # Try alternative approaches
-                    file_data = download_response.content
-                except AttributeError:
-                    try:
-                        file_data = download_response.read()
-                    except (AttributeError, TypeError):
-                        try:
-                            # Maybe it's already bytes
-                            file_data = download_response.contents
-                        except Exception:
-                            # Last resort - the response itself
-                            file_data = download_response
-            
-            # Convert to PIL Image
-            return Image.open(BytesIO(file_data))
+            # Download and decode (cached per normalized path)
+            loader = _load_thumbnail_cached if thumbnail else _load_full_cached
+            return loader(normalized_path)
                 
         except Exception as e:
             st.error(f"❌ Error loading image {file_path}: {str(e)}")
             st.info(f"Error type: {type(e).__name__}")
             return None
 
-    def validate_image_path(self, file_path: str) -> bool:
+    @staticmethod
+    def validate_image_path(file_path: str) -> bool:
         """Validate that the file path is a valid Unity Catalog volume path."""
         if not file_path or not isinstance(file_path, str):
             return False
         
-        volume_path = file_path.strip()
-        return volume_path.startswith('/Volumes/') or volume_path.startswith('dbfs:/Volumes/')
+        return _VOLUMES_RE.match(file_path.strip()) is not None
+
+
+def _download_image(normalized_path: str) -> Image.Image:
+    """Download an image from a Unity Catalog volume and decode it with PIL."""
+    # Use Databricks SDK to download file
+    download_response = get_db_manager().workspace_client.files.download(normalized_path)
+    
+    # Resolve whichever shape the SDK returned into one seekable file object.
+    # download_response.contents is normally a StreamingResponse whose seek()
+    # raises NotImplementedError, so readable-but-unseekable streams are buffered
+    source = getattr(download_response, 'contents', None)
+    if source is None:
+        source = download_response
+    
+    if isinstance(source, (bytes, bytearray)):
+        image_file = BytesIO(source)
+    elif hasattr(source, 'read'):
+        seekable = source.seekable() if hasattr(source, 'seekable') else False
+        image_file = source if seekable else BytesIO(source.read())
+    elif isinstance(getattr(download_response, 'content', None), (bytes, bytearray)):
+        image_file = BytesIO(download_response.content)
+    else:
+        raise TypeError(f"Unsupported download response type: {type(download_response).__name__}")
+    
+    # Decode eagerly, then close the buffers so the raw bytes and the SDK
+    # response don't live as long as the cached image
+    try:
+        image = Image.open(image_file)
+        image.load()
+    finally:
+        for stream in (image_file, source):
+            try:
+                stream.close()
+            except Exception:
+                pass
+    return image
+
+
+def _download_resized(normalized_path: str, max_size: Tuple[int, int]) -> Image.Image:
+    """Download an image and downscale it in place to fit within max_size."""
+    image = _download_image(normalized_path)
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    # Detach from the original decoder state so only the resized copy is cached
+    return image.copy()
+
+
+@st.cache_resource(max_entries=FULL_IMAGE_CACHE_MAX_ENTRIES, show_spinner=False)
+def _load_full_cached(normalized_path: str) -> Image.Image:
+    """Load a full-size display image, cached per normalized path."""
+    # Bound memory per entry - originals beyond this size aren't visible on screen
+    return _download_resized(normalized_path, FULL_IMAGE_MAX_SIZE)
+
+
+@st.cache_resource(max_entries=IMAGE_CACHE_MAX_ENTRIES, show_spinner=False)
+def _load_thumbnail_cached(normalized_path: str) -> Image.Image:
+    """Load a downsized thumbnail, cached per normalized path."""
+    return _download_resized(normalized_path, IMAGE_THUMBNAIL_SIZE)
 
 
-# Global image service instance
-image_service = ImageService()
+# Global image service instance - one per process, shared across sessions
+@st.cache_resource(show_spinner=False)
+def get_image_service() -> ImageService:
+    """Get the shared image service, creating it on first use."""
+    return ImageService()
 
 
 # Convenience functions
-def load_image_from_volume(file_path: str) -> Optional[Image.Image]:
+def load_image_from_volume(file_path: str, thumbnail: bool = False) -> Optional[Image.Image]:
     """Load image from Unity Catalog volume using Databricks SDK."""
-    return image_service.load_image_from_volume(file_path)
+    return get_image_service().load_image_from_volume(file_path, thumbnail)
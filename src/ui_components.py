@@ -4,38 +4,98 @@ UI components module for Unity Catalog Image Gallery.
 Contains Streamlit UI components and layout functions for the gallery interface.
 """
 
+import mmap
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
 import streamlit as st
-import matplotlib.pyplot as plt
 from PIL import Image
 
 from .config import (
-    DEFAULT_SCHEMA, TABLE_NAME, VOLUME_BASE_PATH
+    DEFAULT_SCHEMA, TABLE_NAME, VOLUME_BASE_PATH, IMAGE_THUMBNAIL_SIZE,
+    JPEG_QUALITY, RENDER_CACHE_MAX_ENTRIES, THUMBNAIL_RENDER_CACHE_MAX_ENTRIES,
+    MAX_DROPDOWN_OPTIONS, IMAGE_LOAD_WORKERS
 )
 from .database import (
     get_all_image_paths,
-    get_distinct_labels, get_distinct_label_details, get_score_range
+    get_distinct_label_details, get_filter_facets, clear_filter_cache
 )
-from .image_service import image_service
+from .image_service import get_image_service
 
 
 def clean_file_path_for_display(file_path: str) -> str:
     """Clean file path for better display in dropdown - remove dbfs:/ prefix."""
     if file_path.startswith('dbfs:/Volumes/'):
-        return file_path.replace('dbfs:', '')
+        # Slice off the prefix rather than scanning the whole string with replace()
+        return file_path[5:]
     return file_path
 
 
+def display_names_for_paths(paths: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Compute cleaned display paths and dropdown labels, keyed by raw image path.
+    
+    Labels are basenames, except that a basename shared by several paths is
+    shown with its path relative to the volume. Streamlit maps the chosen
+    label back to an option, so every label must be unique.
+    """
+    display_paths = {path: clean_file_path_for_display(path) for path in paths}
+    # Paths are POSIX volume paths, so rpartition matches os.path.basename
+    # without its per-call fspath/normalization overhead
+    basenames = {path: clean_path.rpartition('/')[2] for path, clean_path in display_paths.items()}
+    
+    name_counts = Counter(basenames.values())
+    volume_prefix = VOLUME_BASE_PATH.rstrip('/') + '/'
+    labels = {}
+    for path, name in basenames.items():
+        if name_counts[name] > 1:
+            clean_path = display_paths[path]
+            name = clean_path[len(volume_prefix):] if clean_path.startswith(volume_prefix) else clean_path
+        labels[path] = name
+    
+    return display_paths, labels
+
+
+def filter_path_options(labels: Dict[str, str], query: str,
+                        selected_path: Optional[str] = None) -> Tuple[List[str], int]:
+    """
+    Find dropdown options whose label contains the query.
+    
+    Returns at most MAX_DROPDOWN_OPTIONS raw paths from ``labels`` and the
+    total number of matches. The current selection is kept at the top as long
+    as it is still one of the filtered paths.
+    """
+    needle = query.strip().lower() if query else ""
+    if needle:
+        matches = [path for path, name in labels.items() if needle in name.lower()]
+    else:
+        matches = list(labels)
+    
+    options = matches[:MAX_DROPDOWN_OPTIONS]
+    if selected_path in labels and selected_path not in options:
+        options.insert(0, selected_path)
+    
+    return options, len(matches)
+
+
 def display_filtering_controls():
     """Display filtering controls and return filter values."""
     st.subheader("🔍 Filter Images")
     
+    # Manual invalidation for cached filter options
+    if st.sidebar.button("🔄 Refresh filters", key="refresh_filters"):
+        clear_filter_cache()
+    
     # Get available filter options from database
     try:
-        labels = get_distinct_labels()
-        score_min, score_max = get_score_range()
+        facets = get_filter_facets()
+        labels = facets['labels']
+        score_min, score_max = map(float, facets['score_range'])
     except Exception as e:
         st.error(f"❌ Error loading filter options: {str(e)}")
+        st.session_state.filters_active = False
         return None, None, None, None
     
     col1, col2 = st.columns(2)
@@ -50,31 +110,22 @@ def display_filtering_controls():
         )
         
         # Label Detail filter (dependent on selected label)
-        if selected_label:
-            label_details = get_distinct_label_details(selected_label)
-            selected_label_detail = st.selectbox(
-                "Filter by Label Detail:",
-                options=[None] + label_details,
-                format_func=lambda x: "All Details" if x is None else str(x),
-                key="label_detail_filter"
-            )
-        else:
-            label_details = get_distinct_label_details()
-            selected_label_detail = st.selectbox(
-                "Filter by Label Detail:",
-                options=[None] + label_details,
-                format_func=lambda x: "All Details" if x is None else str(x),
-                key="label_detail_filter"
-            )
+        label_details = get_distinct_label_details(selected_label)
+        selected_label_detail = st.selectbox(
+            "Filter by Label Detail:",
+            options=[None] + label_details,
+            format_func=lambda x: "All Details" if x is None else str(x),
+            key="label_detail_filter"
+        )
     
     with col2:
         # Score range filter
         st.write("**Score Range:**")
         score_range = st.slider(
             "Select score range:",
-            min_value=float(score_min),
-            max_value=float(score_max),
-            value=(float(score_min), float(score_max)),
+            min_value=score_min,
+            max_value=score_max,
+            value=(score_min, score_max),
             step=0.01,
             key="score_range_filter"
         )
@@ -82,9 +133,43 @@ def display_filtering_controls():
         min_score, max_score = score_range
         st.caption(f"Selected range: {min_score:.2f} - {max_score:.2f}")
     
+    # A narrowed score range counts as a filter even when a bound is 0.0
+    st.session_state.filters_active = (
+        selected_label is not None
+        or selected_label_detail is not None
+        or score_range != (score_min, score_max)
+    )
+    
     return selected_label, selected_label_detail, min_score, max_score
 
 
+def display_image_picker(number: int, prompt: str, labels: Dict[str, str]) -> Optional[str]:
+    """Display a filename search and dropdown, returning the selected raw path."""
+    selector_key = f"image_selector_{number}"
+    
+    st.markdown(f"**🔍 Image {number}**")
+    filename_query = st.text_input(
+        "Filter filenames:",
+        key=f"fname_query_{number}",
+        placeholder="Type part of a filename..."
+    )
+    options, match_count = filter_path_options(
+        labels, filename_query, st.session_state.get(selector_key)
+    )
+    selected_path = st.selectbox(
+        prompt,
+        options,
+        format_func=labels.__getitem__,
+        key=selector_key,
+        index=None,
+        placeholder="Select an image..."
+    )
+    if match_count > MAX_DROPDOWN_OPTIONS:
+        st.caption(f"Showing {MAX_DROPDOWN_OPTIONS} of {match_count} matches - refine the filename filter")
+    
+    return selected_path
+
+
 def display_image_selector() -> None:
     """Display dual dropdown image selector interface with filtering."""
     st.subheader("🔍 AI Image Predictions Browser")
@@ -93,7 +178,7 @@ def display_image_selector() -> None:
     # Display filtering controls
     selected_label, selected_label_detail, min_score, max_score = display_filtering_controls()
     
-    if selected_label or selected_label_detail or min_score or max_score:
+    if st.session_state.filters_active:
         st.markdown("---")
     
     # Get filtered image paths
@@ -101,8 +186,8 @@ def display_image_selector() -> None:
         all_paths = get_all_image_paths(
             label=selected_label,
             label_detail=selected_label_detail,
-            min_score=min_score if min_score else None,
-            max_score=max_score if max_score else None
+            min_score=min_score,
+            max_score=max_score
         )
         
         if not all_paths:
@@ -111,95 +196,213 @@ def display_image_selector() -> None:
         
         st.success(f"✅ Found {len(all_paths)} images matching filters")
         
-        # Clean paths for display (remove dbfs:/ prefix)
-        display_paths = [clean_file_path_for_display(path) for path in all_paths]
+        # Clean paths for display (remove dbfs:/ prefix). Computed directly:
+        # hashing the full path list for a memo costs more than building it
+        display_paths, option_labels = display_names_for_paths(all_paths)
         
         # Create two columns for side-by-side dropdowns
         col1, col2 = st.columns(2)
+        pickers = ((col1, 1, "Choose first image:"), (col2, 2, "Choose second image:"))
+        
+        # Both pickers share the same precomputed label lookup
+        selections = []
+        for column, number, prompt in pickers:
+            with column:
+                selected_path = display_image_picker(number, prompt, option_labels)
+            selections.append((column, f"Image {number}", selected_path))
         
-        with col1:
-            st.markdown("**🔍 Image 1**")
-            selected_index_1 = st.selectbox(
-                "Choose first image:",
-                range(len(display_paths)),
-                format_func=lambda x: os.path.basename(display_paths[x]),
-                key="image_selector_1",
-                index=None,
-                placeholder="Select an image..."
-            )
-            
-            if selected_index_1 is not None:
-                selected_path_1 = all_paths[selected_index_1]
-                display_selected_image(selected_path_1, "Image 1")
+        # Encode the selected images concurrently before rendering either one,
+        # in whichever variant (thumbnail or full size) each panel will show
+        prefetch_display_images([
+            (display_paths[path], not st.session_state.get(view_full_size_key(label), False))
+            for _, label, path in selections
+            if path is not None
+        ])
         
-        with col2:
-            st.markdown("**🔍 Image 2**")
-            selected_index_2 = st.selectbox(
-                "Choose second image:",
-                range(len(display_paths)),
-                format_func=lambda x: os.path.basename(display_paths[x]),
-                key="image_selector_2", 
-                index=None,
-                placeholder="Select an image..."
-            )
-            
-            if selected_index_2 is not None:
-                selected_path_2 = all_paths[selected_index_2]
-                display_selected_image(selected_path_2, "Image 2")
+        for column, label, selected_path in selections:
+            if selected_path is not None:
+                with column:
+                    display_selected_image(selected_path, display_paths[selected_path], label)
                 
     except Exception as e:
         st.error(f"❌ Error loading image paths: {str(e)}")
 
 
-def show_image_with_matplotlib(file_path: str) -> None:
+def open_local_image(file_path: str) -> Image.Image:
+    """
+    Opens and decodes a local image file through a read-only memory map.
+    Args:
+        file_path (str): Path to the image file.
+    """
+    # Decode straight from the OS page cache instead of buffering the file
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            pil_image = Image.open(mapped)
+            pil_image.load()  # Force decode before the mapping is closed
+    return pil_image
+
+
+def load_display_image(file_path: str, thumbnail: bool = False) -> Image.Image:
     """
-    Loads and displays an image using matplotlib.
+    Loads an image as a PIL image, downsized when a thumbnail is requested.
+    Args:
+        file_path (str): Path to the image file.
+        thumbnail (bool): Whether to load the thumbnail variant.
+    Raises:
+        FileNotFoundError: If the image can't be loaded.
+    """
+    # For Unity Catalog volumes, we need to use the workspace client to download
+    if file_path.startswith('/Volumes/'):
+        # Use the existing image service - decoded images are cached there
+        pil_image = get_image_service().load_image_from_volume(f"dbfs:{file_path}", thumbnail)
+        if pil_image is None:
+            raise FileNotFoundError(f"Failed to load image: {file_path}")
+    else:
+        # Direct file access (fallback)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        pil_image = open_local_image(file_path)
+        if thumbnail:
+            pil_image.thumbnail(IMAGE_THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    
+    return pil_image
+
+
+def encode_image(pil_image: Image.Image) -> bytes:
+    """
+    Encode a PIL image to bytes that st.image renders natively.
+    
+    Like st.image's own "auto" format, images with an alpha channel are
+    written as PNG and opaque images as JPEG, which is far smaller and faster
+    to encode for photos.
+    """
+    has_alpha = pil_image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in pil_image.info
+    buffer = BytesIO()
+    if has_alpha:
+        if pil_image.mode not in ('LA', 'P', 'RGBA'):
+            pil_image = pil_image.convert('RGBA')
+        pil_image.save(buffer, format='PNG')
+    else:
+        if pil_image.mode not in ('L', 'RGB'):
+            pil_image = pil_image.convert('RGB')  # e.g. CMYK or palette images
+        pil_image.save(buffer, format='JPEG', quality=JPEG_QUALITY)
+    
+    return buffer.getvalue()
+
+
+# Encoded bytes are cached separately from the decoded PIL images in the image
+# service, so reruns skip both the download and the re-encode
+@st.cache_data(max_entries=RENDER_CACHE_MAX_ENTRIES, show_spinner=False)
+def render_image_bytes(file_path: str) -> bytes:
+    """
+    Loads a full-size image and encodes it to JPEG or PNG bytes for display.
+    Args:
+        file_path (str): Path to the image file.
+    Raises:
+        FileNotFoundError: If the image can't be loaded. Failures are not cached.
+    """
+    return encode_image(load_display_image(file_path))
+
+
+@st.cache_data(max_entries=THUMBNAIL_RENDER_CACHE_MAX_ENTRIES, show_spinner=False)
+def render_thumbnail_bytes(file_path: str) -> bytes:
+    """
+    Loads an image thumbnail and encodes it to JPEG or PNG bytes for display.
+    Args:
+        file_path (str): Path to the image file.
+    Raises:
+        FileNotFoundError: If the image can't be loaded. Failures are not cached.
+    """
+    return encode_image(load_display_image(file_path, thumbnail=True))
+
+
+def rendered_image_keys() -> set:
+    """(path, thumbnail) pairs whose encoded bytes this session has rendered."""
+    return st.session_state.setdefault("rendered_images", set())
+
+
+def prefetch_display_images(requests: List[Tuple[str, bool]]) -> None:
+    """
+    Encode several (path, thumbnail) display images concurrently.
+    
+    Warms the same byte caches the panels render from. Images this session
+    has already rendered are skipped, and failures are left for the panel's
+    own render to report.
+    """
+    rendered = rendered_image_keys()
+    pending = [request for request in dict.fromkeys(requests) if request not in rendered]
+    # A single image gains nothing from a worker - its panel renders it directly
+    if len(pending) < 2:
+        return
+    
+    # Downloads are I/O bound, so overlap them across worker threads
+    with ThreadPoolExecutor(max_workers=min(IMAGE_LOAD_WORKERS, len(pending))) as executor:
+        futures = {
+            executor.submit(
+                render_thumbnail_bytes if thumbnail else render_image_bytes, path
+            ): (path, thumbnail)
+            for path, thumbnail in pending
+        }
+        for future in as_completed(futures):
+            if future.exception() is None:
+                rendered.add(futures[future])
+
+
+def show_full_image(file_path: str) -> None:
+    """
+    Loads and displays a full-size image.
     Args:
         file_path (str): Path to the image file.
     """
     try:
-        # For Unity Catalog volumes, we need to use the workspace client to download
-        if file_path.startswith('/Volumes/'):
-            # Use the existing image service to download the file
-            pil_image = image_service.load_image_from_volume(f"dbfs:{file_path}")
-            if pil_image is None:
-                st.error(f"Failed to load image: {file_path}")
-                return
-        else:
-            # Direct file access (fallback)
-            if not os.path.exists(file_path):
-                st.error(f"File not found: {file_path}")
-                return
-            pil_image = Image.open(file_path)
-        
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(10, 8))
-        ax.imshow(pil_image)
-        ax.axis('off')
-        plt.tight_layout()
+        # Display in Streamlit (encoded bytes are cached per file path)
+        st.image(render_image_bytes(file_path), width="stretch")
+        rendered_image_keys().add((file_path, False))
         
-        # Display in Streamlit
-        st.pyplot(fig)
-        plt.close(fig)
+    except FileNotFoundError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error loading image: {e}")
+
+
+def show_image_thumbnail(file_path: str) -> None:
+    """
+    Loads and displays a downsized preview of an image.
+    Args:
+        file_path (str): Path to the image file.
+    """
+    try:
+        # Display in Streamlit (encoded bytes are cached per file path)
+        st.image(render_thumbnail_bytes(file_path))
+        rendered_image_keys().add((file_path, True))
         
+    except FileNotFoundError as e:
+        st.error(str(e))
     except Exception as e:
         st.error(f"Error loading image: {e}")
 
 
-def display_selected_image(file_path: str, label: str) -> None:
-    """Display a single selected image with matplotlib visualization."""
-    st.markdown(f"**{label}: {os.path.basename(file_path)}**")
+def view_full_size_key(label: str) -> str:
+    """Session state key of the 'View full size' toggle for an image panel."""
+    return f"view_original_{label}"
+
+
+def display_selected_image(raw_path: str, clean_path: str, label: str) -> None:
+    """Display a single selected image with a thumbnail or full-size view."""
+    st.markdown(f"**{label}: {os.path.basename(raw_path)}**")
     
     # Show clean path for user reference
-    clean_path = clean_file_path_for_display(file_path)
     st.caption(f"📁 {clean_path}")
     
-    # Display image using matplotlib
-    show_image_with_matplotlib(clean_path)
+    # Show a thumbnail by default; only fetch full resolution on request
+    if st.toggle("🔍 View full size", key=view_full_size_key(label)):
+        show_full_image(clean_path)
+    else:
+        show_image_thumbnail(clean_path)
     
     # Show file details in an expander
     with st.expander(f"📋 {label} Details"):
-        st.write(f"**Filename:** {os.path.basename(file_path)}")
+        st.write(f"**Filename:** {os.path.basename(raw_path)}")
         st.write(f"**Path:** `{clean_path}`")
 
 